@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
 import os
+import json
+import hashlib
 from together import Together
 from dotenv import load_dotenv
 
@@ -23,14 +25,6 @@ st.set_page_config(
     }
 )
 
-# Ensure light theme
-st.markdown("""
-    <script>
-        var elements = window.parent.document.getElementsByTagName('html');
-        elements[0].setAttribute('data-theme', 'light');
-    </script>
-    """, unsafe_allow_html=True)
-
 # Custom CSS for modern theme
 st.markdown("""
     <style>
@@ -162,17 +156,402 @@ st.markdown("""
 tab1, tab2 = st.tabs(["📊 Analytics Dashboard", "🤖 Complaint Copilot"])
 
 # Load data and initialize OpenAI
+# Paths are relative to this file, so launching from the repo root
+# (streamlit run streamlit-app/app.py) reads and writes the same files
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_CSV = os.path.join(APP_DIR, "sample_data.csv")
+DATA_PARQUET = os.path.join(APP_DIR, "sample_data.parquet")
+DATA_COLUMNS = ['date', 'municipality', 'category', 'complaint_severity',
+                'complaint_en', 'user_text_en', 'image_description']
+
+def normalize_dtypes(df):
+    # Categorical codes make isin/groupby/value_counts work on small ints,
+    # and float32 severities halve the bytes every severity scan reads.
+    # Also applied on load, so Parquet files written by older code match
+    df['category'] = df['category'].astype('category')
+    df['municipality'] = df['municipality'].astype('category')
+    df['complaint_severity'] = pd.to_numeric(df['complaint_severity'], downcast='float')
+    return df
+
+def convert_to_parquet():
+    # Columnar copy of the CSV with dates already parsed; persists across
+    # process restarts so the CSV is only parsed when it changes.
+    # The multithreaded pyarrow parser only decodes the columns the app uses.
+    csv_columns = ['date_created' if col == 'date' else col for col in DATA_COLUMNS]
+    df = pd.read_csv(DATA_CSV, engine='pyarrow', usecols=csv_columns, parse_dates=['date_created'])
+    df = normalize_dtypes(df.rename(columns={'date_created': 'date'}))[DATA_COLUMNS]
+    # Written to a temp file and swapped in, so a killed process or a second
+    # server reading concurrently never sees a half-written file
+    tmp_path = f"{DATA_PARQUET}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, DATA_PARQUET)
+    except OSError:
+        # Read-only app directory: the Parquet copy is only an optimisation,
+        # so serve the parsed frame without it
+        pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return df
+
+def parquet_is_stale():
+    return (not os.path.exists(DATA_PARQUET)
+            or os.path.getmtime(DATA_PARQUET) < os.path.getmtime(DATA_CSV))
+
 @st.cache_data
 def load_data():
-    df = pd.read_csv("sample_data.csv")
-    df['date'] = pd.to_datetime(df['date_created'])
-    return df
+    if parquet_is_stale():
+        df = convert_to_parquet()
+    else:
+        try:
+            df = pd.read_parquet(DATA_PARQUET, columns=DATA_COLUMNS)
+        except (OSError, ValueError):
+            # An unreadable Parquet file counts as stale: rebuild it from the CSV
+            df = convert_to_parquet()
+    # Sorted dates (NaT last) let the date filter binary-search its bounds
+    df = df.sort_values('date', kind='stable').reset_index(drop=True)
+    return normalize_dtypes(df)
+
+@st.cache_data
+def load_filter_options():
+    # Sidebar options and date bounds, computed once; the script body only
+    # needs these, so reruns don't pull a copy of the whole cached frame
+    df = load_data()
+    return (
+        list(df['category'].cat.categories),
+        list(df['municipality'].cat.categories),
+        df['date'].min(),
+        df['date'].max(),
+    )
+
+@st.cache_data
+def get_precomputed():
+    # Flat arrays behind the filter: int32 day ordinals (days since epoch,
+    # missing dates mapped past every real day so they stay sorted last)
+    # and the category codes with name -> code maps
+    df = load_data()
+    days = df['date'].to_numpy().astype('datetime64[D]')
+    ordinals = np.where(np.isnat(days), np.iinfo(np.int32).max, days.astype(np.int64))
+    return {
+        'date_ordinals': ordinals.astype(np.int32),
+        'cat_codes': df['category'].cat.codes.to_numpy(),
+        'muni_codes': df['municipality'].cat.codes.to_numpy(),
+        'cat_lookup': {name: code for code, name in enumerate(df['category'].cat.categories)},
+        'muni_lookup': {name: code for code, name in enumerate(df['municipality'].cat.categories)},
+    }
+
+def code_mask(codes, lookup, values):
+    # Boolean table indexed by category code: one gather over the codes
+    # filters without hashing. The extra last slot is what missing values
+    # (code -1) read, and it stays False.
+    keep = np.zeros(len(lookup) + 1, dtype=bool)
+    keep[np.array([lookup[value] for value in values if value in lookup], dtype=np.intp)] = True
+    return keep[codes]
+
+@st.cache_data
+def filter_complaints(start_date, end_date, categories, municipalities):
+    # Cached on the filter key, so reruns that only touch the chat skip filtering
+    df = load_data()
+    pre = get_precomputed()
+    # Dates are sorted, so the selected days are one contiguous slice,
+    # end date inclusive
+    first_day = np.datetime64(start_date, 'D').astype(np.int64)
+    last_day = np.datetime64(end_date, 'D').astype(np.int64)
+    lo, hi = pre['date_ordinals'].searchsorted([first_day, last_day + 1], side='left')
+    date_slice = df.iloc[lo:hi]
+    # "Select All" keeps every row, so skip the code lookups entirely
+    if categories is None and municipalities is None:
+        return date_slice
+    mask = np.ones(hi - lo, dtype=bool)
+    if categories is not None:
+        mask &= code_mask(pre['cat_codes'][lo:hi], pre['cat_lookup'], categories)
+    if municipalities is not None:
+        mask &= code_mask(pre['muni_codes'][lo:hi], pre['muni_lookup'], municipalities)
+    return date_slice[mask]
+
+def moving_average(values, window):
+    # Trailing mean from a cumulative sum; NaN until the window is full,
+    # matching Series.rolling(window).mean()
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.size, np.nan)
+    if values.size >= window:
+        csum = np.cumsum(values)
+        csum[window:] = csum[window:] - csum[:-window]
+        result[window - 1:] = csum[window - 1:] / window
+    return result
+
+# Chart aggregates keyed on the filter selection, shared by both tabs and
+# reused while the selection is unchanged. They aggregate narrow projections
+# so the wide text columns are never walked.
+@st.cache_data
+def get_daily_complaints(start_date, end_date, categories, municipalities):
+    filtered_df = filter_complaints(start_date, end_date, categories, municipalities)
+    # Dense per-day histogram via bincount on day offsets; empty days count 0
+    # The 7-day moving average is computed here too, once per selection
+    days = filtered_df['date'].to_numpy().astype('datetime64[D]')
+    if days.size == 0:
+        return pd.DataFrame({'date': pd.Series(dtype='datetime64[ns]'),
+                             'count': pd.Series(dtype='int64'),
+                             'moving_avg': pd.Series(dtype='float64')})
+    first_day = days.min()
+    counts = np.bincount((days - first_day).astype(np.int64))
+    dates = (first_day + np.arange(counts.size)).astype('datetime64[ns]')
+    return pd.DataFrame({'date': dates, 'count': counts, 'moving_avg': moving_average(counts, 7)})
+
+@st.cache_data
+def get_category_counts(start_date, end_date, categories, municipalities):
+    filtered_df = filter_complaints(start_date, end_date, categories, municipalities)
+    # bincount over the category codes instead of a hashing value_counts
+    names = filtered_df['category'].cat.categories
+    codes = filtered_df['category'].cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(names))
+    category_counts = pd.Series(counts, index=names, name='count')
+    return category_counts[category_counts > 0].sort_values(ascending=False, kind='stable')
+
+@st.cache_data
+def get_municipality_stats(start_date, end_date, categories, municipalities):
+    filtered_df = filter_complaints(start_date, end_date, categories, municipalities)
+    # Three bincount sweeps over the category codes replace groupby().agg():
+    # one finds municipalities with any complaint, two give the rated count
+    # and severity sum; unrated complaints are left out like agg() does
+    names = filtered_df['municipality'].cat.categories
+    codes = filtered_df['municipality'].cat.codes.to_numpy()
+    severity = filtered_df['complaint_severity'].to_numpy()
+    rated = ~np.isnan(severity) & (codes >= 0)
+    present = np.bincount(codes[codes >= 0], minlength=len(names)) > 0
+    counts = np.bincount(codes[rated], minlength=len(names))
+    sums = np.bincount(codes[rated], weights=severity[rated], minlength=len(names))
+    means = np.divide(sums, counts, out=np.full(len(names), np.nan), where=counts > 0)
+    municipality_stats = pd.DataFrame({
+        'municipality': names[present],
+        'avg_severity': means[present],
+        'complaint_count': counts[present],
+    })
+    return municipality_stats.sort_values('avg_severity', ascending=True)
+
+MAX_TREND_POINTS = 2000
+MAX_DETAIL_ROWS = 500
+DETAIL_PAGE_SIZE = 50
+# The detail table shows every loaded column
+DETAIL_COLUMNS = DATA_COLUMNS
+MAX_CONTEXT_COMPLAINTS = 20
+CONTEXT_COLUMNS = ['date', 'municipality', 'category', 'complaint_severity', 'user_text_en']
+
+@st.cache_data
+def get_complaint_metrics(start_date, end_date, categories, municipalities):
+    # Top metrics, computed from the severity array instead of four frame scans
+    filtered_df = filter_complaints(start_date, end_date, categories, municipalities)
+    severity = filtered_df['complaint_severity'].to_numpy()
+    rated = severity[~np.isnan(severity)]
+    mean_severity = float(rated.mean(dtype=np.float64)) if rated.size else float('nan')
+    high_severity = int(np.count_nonzero(severity >= 7))
+    # Distinct municipalities: mark each code seen, then count the marks
+    muni = filtered_df['municipality'].cat
+    codes = muni.codes.to_numpy()
+    seen = np.zeros(len(muni.categories), dtype=bool)
+    seen[codes[codes >= 0]] = True
+    municipalities_count = int(np.count_nonzero(seen))
+    return severity.size, mean_severity, high_severity, municipalities_count
+
+@st.cache_data
+def get_detail_rows(start_date, end_date, categories, municipalities):
+    # Newest rows for the detail table; rows are already sorted by date,
+    # so a reversed slice replaces any sort
+    filtered_df = filter_complaints(start_date, end_date, categories, municipalities)
+    return filtered_df[DETAIL_COLUMNS].iloc[::-1].head(MAX_DETAIL_ROWS)
+
+@st.cache_data
+def build_chat_context(start_date, end_date, categories, municipalities):
+    # Compact summary plus the most severe complaints, so the prompt size
+    # stays bounded however many rows the filters select
+    filtered_df = filter_complaints(start_date, end_date, categories, municipalities)
+    category_counts = get_category_counts(start_date, end_date, categories, municipalities)
+    municipality_stats = get_municipality_stats(start_date, end_date, categories, municipalities)
+    total_complaints, mean_severity, _, _ = get_complaint_metrics(start_date, end_date, categories, municipalities)
+    # Top-k rated rows by severity: np.partition finds the k-th value in
+    # linear time, then only those k rows are sorted (ties keep row order)
+    severity = filtered_df['complaint_severity'].to_numpy()
+    top = np.flatnonzero(~np.isnan(severity))
+    if top.size > MAX_CONTEXT_COMPLAINTS:
+        kth = np.partition(severity[top], top.size - MAX_CONTEXT_COMPLAINTS)[top.size - MAX_CONTEXT_COMPLAINTS]
+        above = top[severity[top] > kth]
+        tied = top[severity[top] == kth][:MAX_CONTEXT_COMPLAINTS - above.size]
+        top = np.sort(np.concatenate([above, tied]))
+    top = top[np.argsort(-severity[top], kind='stable')]
+    most_severe = filtered_df[CONTEXT_COLUMNS].iloc[top]
+    summary = {
+        'time_period': f"{start_date} to {end_date}",
+        'total_complaints': total_complaints,
+        'average_severity': round(mean_severity, 2),
+        'complaints_per_category': {name: int(count) for name, count in category_counts.items()},
+        'municipalities': [
+            {'municipality': row.municipality,
+             'average_severity': round(float(row.avg_severity), 2),
+             'complaint_count': int(row.complaint_count)}
+            for row in municipality_stats.itertuples()
+        ],
+    }
+    # CSV repeats no field names per row, so the sample costs fewer tokens
+    return (
+        f"Summary: {json.dumps(summary, ensure_ascii=False)}\n\n"
+        f"Most severe complaints (CSV):\n"
+        f"{most_severe.to_csv(index=False, date_format='%Y-%m-%d %H:%M')}"
+    )
+
+def lttb_indices(values, n_out):
+    # Largest-Triangle-Three-Buckets over an evenly spaced series: picks the
+    # n_out points that best preserve the line's visual shape
+    n = len(values)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    y = np.asarray(values, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    keep = np.empty(n_out, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = (end + next_end - 1) / 2
+        next_y = y[end:next_end].mean()
+        x = np.arange(start, end)
+        area = np.abs((a - next_x) * (y[start:end] - y[a]) - (a - x) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+# Chart builders. They take small NumPy arrays (or the small aggregate frame)
+# so Streamlit hashes their inputs cheaply, and the built figures are reused
+# while the inputs are unchanged.
+@st.cache_data
+def build_daily_trend_fig(dates, counts, moving_avg):
+    # Time series of complaints with trend (Daily), downsampled for long ranges
+    keep = lttb_indices(counts, MAX_TREND_POINTS)
+    # WebGL traces keep long date ranges responsive in the browser
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=dates[keep],
+        y=counts[keep],
+        mode='lines',
+        name='Daily Complaints',
+        showlegend=False,
+        line=dict(color='#2E86C1', width=2)
+    ))
+    fig.add_trace(go.Scattergl(
+        x=dates[keep],
+        y=moving_avg[keep],
+        mode='lines',
+        name='7-day Moving Average',
+        line=dict(color='#E74C3C', width=2, dash='dash')
+    ))
+    fig.update_xaxes(title_text='Date', tickformat="%Y-%m-%d", tickmode='auto', nticks=10)
+    fig.update_yaxes(title_text='Number of Complaints')
+    
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        hovermode='x unified',
+        title_text='Daily Complaints Trend Analysis',
+        title_x=0.5,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+@st.cache_data
+def build_category_pie(names, counts):
+    fig = px.pie(values=counts,
+                names=names,
+                title='Complaint Categories Distribution',
+                hole=0.4,
+                color_discrete_sequence=px.colors.qualitative.Set3)
+    
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        title_x=0.5,
+        legend=dict(orientation="h", y=-0.2)
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    return fig
+
+@st.cache_data
+def build_severity_hist(rated, mean_severity):
+    # Binned here so only the bar heights are sent to the browser
+    counts, edges = np.histogram(rated, bins=20)
+    centers = (edges[:-1] + edges[1:]) / 2
+    fig = go.Figure(go.Bar(x=centers, y=counts, marker_color='#3498db'))
+    fig.update_xaxes(title_text='Severity Score')
+    fig.update_yaxes(title_text='Number of Complaints')
+    
+    fig.add_vline(x=mean_severity, 
+                line_dash="dash", 
+                line_color="red",
+                annotation_text=f"Mean: {mean_severity:.2f}")
+    
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        title_x=0.5,
+        title_text='Severity Score Distribution Analysis',
+        bargap=0.1,
+        showlegend=False
+    )
+    return fig
+
+@st.cache_data
+def build_municipality_bar(municipality_stats):
+    fig = px.bar(municipality_stats, 
+                x='avg_severity',
+                y='municipality',
+                title='Municipality Severity Analysis',
+                labels={'avg_severity': 'Average Severity Score', 'municipality': 'Municipality'},
+                orientation='h',
+                color='complaint_count',
+                color_continuous_scale='Viridis')
+    
+    fig.update_layout(
+        height=400,
+        template='plotly_white',
+        title_x=0.5,
+        coloraxis_colorbar_title="Number of Complaints"
+    )
+    return fig
+
+def session_memo(name, key, build):
+    # Reuse the object built on an earlier rerun of this session while its
+    # key is unchanged, skipping even the cache lookups behind build()
+    cached = st.session_state.get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = build()
+    st.session_state[name] = (key, value)
+    return value
 
 @st.cache_resource
 def init_together():
     return Together(api_key=os.getenv('TOGETHER_API_KEY'))
 
-df = load_data()
+CHAT_MODEL = "meta-llama/Llama-3-8b-chat-hf"
+CHAT_TEMPERATURE = 0.3
+STREAM_RENDER_EVERY = 8
+CHAT_SYSTEM_PROMPT = """You are an analyst for the Kosovo Municipality Complaints system.
+                         Analyze the provided complaints data and answer questions clearly and concisely.
+                         Focus on providing actionable insights and clear patterns in the data."""
+
+@st.cache_resource(ttl=3600)
+def answer_cache():
+    # Finished Copilot answers shared across sessions, cleared hourly. A plain
+    # dict rather than st.cache_data so cache misses can still be streamed.
+    return {}
+
+all_categories, all_municipalities, first_date, last_date = load_filter_options()
 client = init_together()
 
 # Sidebar filters
@@ -181,14 +560,14 @@ st.sidebar.header("Filters")
 # Date range filter
 date_range = st.sidebar.date_input(
     "Select Date Range",
-    [df['date'].min(), df['date'].max()],
-    min_value=df['date'].min(),
-    max_value=df['date'].max()
+    [first_date, last_date],
+    min_value=first_date,
+    max_value=last_date
 )
 
 # Category filter with "Select All" option
-all_categories = sorted(df['category'].unique())
-if st.sidebar.checkbox("Select All Categories", value=True):
+all_categories_selected = st.sidebar.checkbox("Select All Categories", value=True)
+if all_categories_selected:
     categories = all_categories
 else:
     categories = st.sidebar.multiselect(
@@ -198,8 +577,8 @@ else:
     )
 
 # Municipality filter with "Select All" option  
-all_municipalities = sorted(df['municipality'].unique())
-if st.sidebar.checkbox("Select All Municipalities", value=True):
+all_municipalities_selected = st.sidebar.checkbox("Select All Municipalities", value=True)
+if all_municipalities_selected:
     municipalities = all_municipalities
 else:
     municipalities = st.sidebar.multiselect(
@@ -209,13 +588,16 @@ else:
     )
 
 # Apply filters
-mask = (
-    (df['date'].dt.date >= date_range[0]) & 
-    (df['date'].dt.date <= date_range[1]) &
-    (df['category'].isin(categories)) &
-    (df['municipality'].isin(municipalities))
+# None stands for "Select All" so the key stays small and hashable
+filter_key = (
+    date_range[0],
+    date_range[1],
+    None if all_categories_selected else tuple(sorted(categories)),
+    None if all_municipalities_selected else tuple(sorted(municipalities)),
 )
-filtered_df = df[mask]
+# Kept in session state under the filter key, so reruns that leave the
+# filters alone (paging, chat) skip the copy st.cache_data hands back
+filtered_df = session_memo("filtered_df", filter_key, lambda: filter_complaints(*filter_key))
 
 
 # Tab 1 - Analytics Dashboard
@@ -231,18 +613,17 @@ with tab1:
         </div>
     """, unsafe_allow_html=True)
     
-    # Top metrics
+    # Top metrics; the severity mean is computed once and shared with the histogram
+    total_complaints, mean_severity, high_severity, municipalities_count = get_complaint_metrics(*filter_key)
+
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Complaints", len(filtered_df))
+        st.metric("Total Complaints", total_complaints)
     with col2:
-        avg_severity = round(filtered_df['complaint_severity'].mean(), 2)
-        st.metric("Average Severity", avg_severity)
+        st.metric("Average Severity", round(mean_severity, 2))
     with col3:
-        high_severity = len(filtered_df[filtered_df['complaint_severity'] >= 7])
         st.metric("High Severity Cases", high_severity)
     with col4:
-        municipalities_count = filtered_df['municipality'].nunique()
         st.metric("Municipalities", municipalities_count)
 
     # Charts
@@ -252,116 +633,56 @@ with tab1:
     col1, col2 = st.columns(2)
 
     with col1:
-        # Time series of complaints with trend (Daily)
-        daily_complaints = filtered_df.groupby(pd.Grouper(key='date', freq='D')).size().reset_index(name='count')
-        fig = px.line(daily_complaints, x='date', y='count',
-                    title='Daily Complaints Trend Analysis',
-                    labels={'count': 'Number of Complaints', 'date': 'Date'})
-        
-        fig.update_traces(line=dict(color='#2E86C1', width=2))
-        fig.update_xaxes(tickformat="%Y-%m-%d", tickmode='auto', nticks=10)
-        
-        fig.add_trace(go.Scatter(
-            x=daily_complaints['date'],
-            y=daily_complaints['count'].rolling(window=7).mean(),
-            name='7-day Moving Average',
-            line=dict(color='#E74C3C', width=2, dash='dash')
-        ))
-        
-        fig.update_layout(
-            height=400,
-            template='plotly_white',
-            hovermode='x unified',
-            title_x=0.5,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-        st.plotly_chart(fig, use_container_width=True, key="daily_complaints_2")
+        def build():
+            daily_complaints = get_daily_complaints(*filter_key)
+            return build_daily_trend_fig(daily_complaints['date'].to_numpy(),
+                                         daily_complaints['count'].to_numpy(),
+                                         daily_complaints['moving_avg'].to_numpy())
+        fig = session_memo("daily_complaints_fig", filter_key, build)
+        st.plotly_chart(fig, use_container_width=True, key="daily_complaints")
 
     with col2:
         # Category distribution
-        category_counts = filtered_df['category'].value_counts()
-        fig = px.pie(values=category_counts.values,
-                    names=category_counts.index,
-                    title='Complaint Categories Distribution',
-                    hole=0.4,
-                    color_discrete_sequence=px.colors.qualitative.Set3)
-        
-        fig.update_layout(
-            height=400,
-            template='plotly_white',
-            title_x=0.5,
-            legend=dict(orientation="h", y=-0.2)
-        )
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig, use_container_width=True, key="category_dist_2")
+        def build():
+            category_counts = get_category_counts(*filter_key)
+            return build_category_pie(tuple(category_counts.index), category_counts.to_numpy())
+        fig = session_memo("category_dist_fig", filter_key, build)
+        st.plotly_chart(fig, use_container_width=True, key="category_dist")
 
     # Row 2 - Severity distribution and municipality comparison
     col1, col2 = st.columns(2)
 
     with col1:
         # Severity distribution
-        fig = px.histogram(filtered_df, x='complaint_severity',
-                        title='Severity Score Distribution Analysis',
-                        labels={'complaint_severity': 'Severity Score', 'count': 'Number of Complaints'},
-                        nbins=20,
-                        color_discrete_sequence=['#3498db'])
-        
-        fig.add_vline(x=filtered_df['complaint_severity'].mean(), 
-                    line_dash="dash", 
-                    line_color="red",
-                    annotation_text=f"Mean: {filtered_df['complaint_severity'].mean():.2f}")
-        
-        fig.update_layout(
-            height=400,
-            template='plotly_white',
-            title_x=0.5,
-            bargap=0.1,
-            showlegend=False
-        )
-        st.plotly_chart(fig, use_container_width=True, key="severity_dist_2")
+        fig = session_memo("severity_dist_fig", filter_key,
+                           lambda: build_severity_hist(filtered_df['complaint_severity'].dropna().to_numpy(), mean_severity))
+        st.plotly_chart(fig, use_container_width=True, key="severity_dist")
 
     with col2:
         # Municipality comparison
-        municipality_stats = filtered_df.groupby('municipality').agg({
-            'complaint_severity': ['mean', 'count']
-        }).reset_index()
-        municipality_stats.columns = ['municipality', 'avg_severity', 'complaint_count']
-        municipality_stats = municipality_stats.sort_values('avg_severity', ascending=True)
-
-        fig = px.bar(municipality_stats, 
-                    x='avg_severity',
-                    y='municipality',
-                    title='Municipality Severity Analysis',
-                    labels={'avg_severity': 'Average Severity Score', 'municipality': 'Municipality'},
-                    orientation='h',
-                    color='complaint_count',
-                    color_continuous_scale='Viridis')
-        
-        fig.update_layout(
-            height=400,
-            template='plotly_white',
-            title_x=0.5,
-            coloraxis_colorbar_title="Number of Complaints"
-        )
-        st.plotly_chart(fig, use_container_width=True, key="municipality_analysis_2")
+        fig = session_memo("municipality_analysis_fig", filter_key,
+                           lambda: build_municipality_bar(get_municipality_stats(*filter_key)))
+        st.plotly_chart(fig, use_container_width=True, key="municipality_analysis")
 
     # Detailed complaints table
     st.subheader("Detailed Complaints")
-    cols_to_show = ['date', 'municipality', 'category', 'complaint_severity', 'complaint_en','user_text_en','image_description']
+    # Only the newest rows are sorted, and one page of them is sent to the browser
+    detail_df = get_detail_rows(*filter_key)
+    page_count = max(1, -(-len(detail_df) // DETAIL_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    page_start = (page - 1) * DETAIL_PAGE_SIZE
     st.dataframe(
-        filtered_df[cols_to_show].sort_values('date', ascending=False),
+        detail_df.iloc[page_start:page_start + DETAIL_PAGE_SIZE],
         use_container_width=True,
         height=400
     )
+    st.caption(f"Page {page} of {page_count} · newest {len(detail_df)} of {len(filtered_df)} complaints")
 
 # Tab 2 - Q&A Interface
-with tab2:
+# A fragment, so sending a message reruns only the chat panel instead of the
+# whole dashboard; the filter key is the one from the last full run
+@st.fragment
+def chat_panel(filter_key):
     prompt = st.chat_input("Ask a question about the complaints data")
     st.markdown("""
         <div style='text-align: center; margin-bottom: 2rem;'>
@@ -393,34 +714,47 @@ with tab2:
             st.markdown(prompt)
 
         # Create context from filtered data
-        context = f"""
-        Analysis context:
-        - Time period: {date_range[0]} to {date_range[1]}
-        - Total complaints: {len(filtered_df)}
-        - Categories: {', '.join(filtered_df['category'].unique())}
-        - Municipalities: {', '.join(filtered_df['municipality'].unique())}
-        - Average severity: {filtered_df['complaint_severity'].mean():.2f}
-        
-        Detailed complaints:
-        {filtered_df[['date', 'municipality', 'category', 'complaint_severity', 'user_text_en']].to_string()}
-        """
+        context = build_chat_context(*filter_key)
+
+        # Repeat questions on the same data are answered from the cache
+        context_key = hashlib.blake2b(f"{CHAT_SYSTEM_PROMPT}\n{context}".encode(), digest_size=16).hexdigest()
+        cache_key = (CHAT_MODEL, CHAT_TEMPERATURE, context_key, prompt)
+        answers = answer_cache()
 
-        # Display assistant response
+        # Display assistant response, streamed as tokens arrive
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                response = client.chat.completions.create(
-                    model="meta-llama/Llama-3-8b-chat-hf",
-                    messages=[
-                        {"role": "system", "content": """You are an analyst for the Kosovo Municipality Complaints system.
-                         Analyze the provided complaints data and answer questions clearly and concisely.
-                         Focus on providing actionable insights and clear patterns in the data."""},
-                        {"role": "user", "content": f"Based on this data:\n{context}\n\nQuestion: {prompt}"}
-                    ],
-                    temperature=0.3,
-                    max_tokens=1000
-                )
-                response_content = response.choices[0].message.content
+            if cache_key in answers:
+                response_content = answers[cache_key]
                 st.markdown(response_content)
-                
+            else:
+                with st.spinner("Thinking..."):
+                    stream = client.chat.completions.create(
+                        model=CHAT_MODEL,
+                        messages=[
+                            {"role": "system", "content": CHAT_SYSTEM_PROMPT},
+                            {"role": "user", "content": f"Based on this data:\n{context}\n\nQuestion: {prompt}"}
+                        ],
+                        temperature=CHAT_TEMPERATURE,
+                        max_tokens=1000,
+                        stream=True
+                    )
+                # Redraw every few chunks rather than once per token
+                placeholder = st.empty()
+                parts = []
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    parts.append(chunk.choices[0].delta.content or "")
+                    if len(parts) % STREAM_RENDER_EVERY == 0:
+                        placeholder.markdown("".join(parts))
+                response_content = "".join(parts)
+                placeholder.markdown(response_content)
+                # An empty stream is not an answer; don't serve it to other sessions
+                if response_content.strip():
+                    answers[cache_key] = response_content
+
         # Add assistant response to chat history
         st.session_state.messages.append({"role": "assistant", "content": response_content})
+
+with tab2:
+    chat_panel(filter_key)